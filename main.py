@@ -1,20 +1,15 @@
 import re
 import json
-from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import os
 from typing import Dict, List, Any
 import subprocess
 import sys
 
-# Zone Info Dumper Script execution
-process = subprocess.Popen(["/bin/bash", "dns_dumper.sh"])
-# Wait for the process to complete and store the return code
-return_code = process.wait()
-# Check if the script executed successfully
-if return_code == 0:
-    print("DNS Zone Query Successful")
-else:
-    sys.exit("DNS Zone Query Failed")
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Constants for DNS configuration
 ZONE_FILE = "zone.txt"
@@ -23,29 +18,128 @@ DOMAIN_NAME = "internal.example.com"
 SOA_NS_ENTRY = "mstbind.example.com"
 SOA_HOSTMASTER_ENTRY = "hostmaster.example.com."
 HOST_IPV4 = "192.168.0.0."
+# Derived mstbind values used in the reverse zones
+_HOST_OCTETS = HOST_IPV4.split('.')
+_MSTBIND_SUBNET = '.'.join(_HOST_OCTETS[:3])
+_REV_HOST = '.'.join(reversed(_HOST_OCTETS))
+_MSTBIND_PTR = _REV_HOST.partition('.')[0]
 
-# Ensure necessary directories exist
-for dir in ["forward_zone", "reverse_zone", "json"]:
-    os.makedirs(dir, exist_ok=True)
+# Write json/{zone}.json debug output only when DEBUG_JSON is set
+DEBUG_JSON = bool(os.environ.get("DEBUG_JSON"))
+IO_BUFFER_SIZE = 1 << 17  # 128 KiB buffer for zone reads and writes
 
-def parse_record(line: str) -> Dict[str, Any]:
+# Matches key=value parameters in a record line (e.g. "ttl=3600")
+_KV_RE = re.compile(r'(\w+)=([^,\s]+)')
+
+class Record:
+    """
+    A single parsed DNS record.
+    """
+    __slots__ = ('type', 'domain', 'ip', 'ttl', 'serial', 'refresh', 'retry', 'expire', 'minttl', 'params')
+
+    # Named fields written to the debug JSON, before the remaining params
+    FIELDS = ('type', 'domain', 'ip', 'ttl', 'serial', 'refresh', 'retry', 'expire', 'minttl')
+    SOA_FIELDS = ('serial', 'refresh', 'retry', 'expire', 'minttl')
+
+    def __init__(self, record_type: str):
+        self.type = record_type
+        self.domain = None
+        self.ip = None
+        self.ttl = None
+        self.serial = None
+        self.refresh = None
+        self.retry = None
+        self.expire = None
+        self.minttl = None
+        # Remaining key=value parameters (e.g. flags, ns, email)
+        self.params = {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return the record as a dictionary, used for the debug JSON output.
+        """
+        data = {field: getattr(self, field) for field in Record.FIELDS
+                if getattr(self, field) is not None}
+        data.update(self.params)
+        return data
+
+def parse_params(details: str) -> Dict[str, str]:
+    """
+    Parse the key=value parameters of a record line into a dictionary.
+    """
+    params = {}
+    for token in details.replace(',', ' ').split():
+        key, sep, value = token.partition('=')
+        if sep and value and key.isalnum():
+            params[key] = value
+        else:
+            # Tokens such as "(flags=f0" or quoted TXT data need the full pattern
+            params.update(_KV_RE.findall(token))
+    return params
+
+def run_dns_dumper():
+    """
+    Run the zone info dumper script and exit if it fails.
     """
-    Parse a single DNS record line and return a dictionary of its components.
+    # Zone Info Dumper Script execution
+    process = subprocess.Popen(["/bin/bash", "dns_dumper.sh"])
+    # Wait for the process to complete and store the return code
+    return_code = process.wait()
+    # Check if the script executed successfully
+    if return_code == 0:
+        print("DNS Zone Query Successful")
+    else:
+        sys.exit("DNS Zone Query Failed")
+
+def _ensure_dirs():
+    """
+    Ensure the output directories exist.
+    """
+    dirs = ["forward_zone", "reverse_zone"]
+    if DEBUG_JSON:
+        dirs.append("json")
+    for dir in dirs:
+        os.makedirs(dir, exist_ok=True)
+
+def parse_record(line: str) -> Record:
+    """
+    Parse a single DNS record line and return its Record.
     """
     parts = line.strip().split(':', 1)
     record_type = parts[0].strip()
     details = parts[1].strip() if len(parts) > 1 else ""
     
-    record = {"type": record_type}
+    record = Record(record_type)
     
     # Handle specific record types
-    if record_type in ["SOA", "NS", "CNAME"]:
-        record["domain"] = details.split()[0]
-    elif record_type == "A":
-        record["ip"] = details.split()[0]
-    
-    # Parse additional parameters
-    record.update(dict(re.findall(r'(\w+)=([^,\s]+)', details)))
+    if record_type in ["NS", "CNAME", "A"]:
+        # These carry no key=value fields other than the trailing
+        # (flags=..., serial=..., ttl=...) block, so only the ttl is read
+        value = details.split(None, 1)[0]
+        if record_type == "A":
+            record.ip = value
+        else:
+            record.domain = sys.intern(value)
+        _, sep, ttl = details.rpartition('ttl=')
+        ttl = ttl.split(',', 1)[0].split()
+        if sep and ttl:
+            # The ttl is the last parameter and carries the closing parenthesis
+            record.ttl = sys.intern(ttl[0].rstrip(')'))
+    else:
+        if record_type == "SOA":
+            record.domain = sys.intern(details.split()[0])
+
+        # Parse additional parameters
+        params = parse_params(details)
+        ttl = params.pop('ttl', None)
+        if ttl is not None:
+            record.ttl = sys.intern(ttl.rstrip(')'))
+        record.serial = params.pop('serial', None)
+        record.refresh = params.pop('refresh', None)
+        record.retry = params.pop('retry', None)
+        record.expire = params.pop('expire', None)
+        record.minttl = params.pop('minttl', None)
+        record.params = params
     
     return record
 
@@ -53,26 +147,36 @@ def parse_file(file_path: str) -> Dict[str, Any]:
     """
     Parse the entire DNS zone file and return a structured dictionary of its contents.
     """
-    with open(file_path, 'r') as file:
-        lines = file.readlines()
-
     dns_data = {}
-    current_name = None
-
-    for line in lines:
-        line = line.strip()
-        if line.startswith("Name="):
-            # Parse the Name, Records, and Children fields
-            name, records, children = [part.split('=')[1] for part in line.split(',')]
-            name = name or "root"
-            dns_data[name] = {
-                "Records": int(records),
-                "Children": int(children),
-                "DNS_Records": []
-            }
-            current_name = name
-        elif line and current_name:
-            dns_data[current_name]["DNS_Records"].append(parse_record(line))
+    # Bound append of the current name's record list and its by_type index,
+    # set by each Name= line
+    add_record = None
+    type_bucket = None
+    parse = parse_record
+
+    with open(file_path, 'r', buffering=IO_BUFFER_SIZE) as file:
+        for line in file:
+            line = line.strip()
+            if line.startswith("Name="):
+                # Parse the Name, Records, and Children fields
+                name, records, children = [part.split('=')[1] for part in line.split(',')]
+                name = name or "root"
+                dns_records = []
+                by_type = {"SOA": [], "NS": [], "A": [], "CNAME": []}
+                dns_data[name] = {
+                    "Records": int(records),
+                    "Children": int(children),
+                    "DNS_Records": dns_records,
+                    "by_type": by_type
+                }
+                add_record = dns_records.append
+                type_bucket = by_type.get
+            elif line and add_record is not None:
+                record = parse(line)
+                add_record(record)
+                bucket = type_bucket(record.type)
+                if bucket is not None:
+                    bucket.append(record)
 
     return dns_data
 
@@ -80,155 +184,234 @@ def generate_bind9_zone(json_data: Dict[str, Any], zone_name: str, output_file:
     """
     Generate a BIND9 zone file from the parsed JSON data.
     """
-    with open(output_file, 'w') as f:
-        # Write SOA record
-        soa = next(r for r in json_data['root']['DNS_Records'] if r['type'] == 'SOA')
-        f.write(f"$TTL {soa['ttl'].strip(')')}\n")
-        f.write(f"@ IN SOA {SOA_NS_ENTRY}. {SOA_HOSTMASTER_ENTRY} (\n")
-        for field in ['serial', 'refresh', 'retry', 'expire', 'minttl']:
-            f.write(f"\t{soa[field]}\t; {field.capitalize()}\n")
-        f.write(")\n\n")
+    root = json_data['root']['by_type']
+    soa = root['SOA'][0]
+    ns_records = root['NS']
+
+    # Group A and CNAME records by ttl
+    a_records = {}
+    cname_records = {}
+    a_bucket = a_records.get
+    cname_bucket = cname_records.get
+
+    for domain, data in json_data.items():
+        if domain != 'root':
+            by_type = data['by_type']
+            for record in by_type['A']:
+                ttl = record.ttl
+                bucket = a_bucket(ttl)
+                if bucket is None:
+                    if ttl is None:
+                        raise ValueError(f"A record for {domain} in {zone_name} has no ttl")
+                    bucket = a_records[ttl] = []
+                bucket.append((domain, record.ip))
+            for record in by_type['CNAME']:
+                ttl = record.ttl
+                bucket = cname_bucket(ttl)
+                if bucket is None:
+                    if ttl is None:
+                        raise ValueError(f"CNAME record for {domain} in {zone_name} has no ttl")
+                    bucket = cname_records[ttl] = []
+                bucket.append((domain, record.domain))
+
+    parts = []
+    append = parts.append
 
-        # Add NS record for mstbind to every forward zone
-        f.write(f"@\tIN\tNS\t{SOA_NS_ENTRY}.\n\n")
+    # Write SOA record
+    for field in ('ttl',) + Record.SOA_FIELDS:
+        if getattr(soa, field) is None:
+            raise ValueError(f"SOA record in {zone_name} has no {field}")
+    append(f"$TTL {soa.ttl}\n")
+    append(f"@ IN SOA {SOA_NS_ENTRY}. {SOA_HOSTMASTER_ENTRY} (\n")
+    for field in Record.SOA_FIELDS:
+        append(f"\t{getattr(soa, field)}\t; {field.capitalize()}\n")
+    append(")\n\n")
 
-        # Add A record for mstbind only if the zone matches
-        if zone_name.endswith(HIGH_LEVEL_DOMAIN):
-            f.write(f"{SOA_NS_ENTRY}.\tIN\tA\t{HOST_IPV4}\n\n")
+    # Add NS record for mstbind to every forward zone
+    append(f"@\tIN\tNS\t{SOA_NS_ENTRY}.\n\n")
 
-        # Write NS records
-        for record in json_data['root']['DNS_Records']:
-            if record['type'] == 'NS':
-                f.write(f"@\t{record['ttl'].strip(')')}\tIN NS\t{record['domain']}\n")
-        f.write("\n")
+    # Add A record for mstbind only if the zone matches
+    if zone_name.endswith(HIGH_LEVEL_DOMAIN):
+        append(f"{SOA_NS_ENTRY}.\tIN\tA\t{HOST_IPV4}\n\n")
 
-        # Group A and CNAME records
-        a_records = defaultdict(list)
-        cname_records = defaultdict(list)
+    # Write NS records
+    for record in ns_records:
+        if record.ttl is None:
+            raise ValueError(f"NS record {record.domain} in {zone_name} has no ttl")
+        append(f"@\t{record.ttl}\tIN NS\t{record.domain}\n")
+    append("\n")
 
-        for domain, data in json_data.items():
-            if domain != 'root':
-                for record in data['DNS_Records']:
-                    if record['type'] == 'A':
-                        a_records[record['ttl'].strip(')')].append((domain, record['ip']))
-                    elif record['type'] == 'CNAME':
-                        cname_records[record['ttl'].strip(')')].append((domain, record['domain']))
+    write_grouped_records(parts, "A", a_records)
+    write_grouped_records(parts, "CNAME", cname_records)
 
-        write_grouped_records(f, "A", a_records)
-        write_grouped_records(f, "CNAME", cname_records)
+    with open(output_file, 'w', buffering=IO_BUFFER_SIZE) as f:
+        f.write("".join(parts))
 
-def write_grouped_records(file, record_type: str, records: Dict[str, List[tuple]]):
+def write_grouped_records(parts: List[str], record_type: str, records: Dict[str, List[tuple]]):
     """
-    Write grouped DNS records (A or CNAME) to the zone file.
+    Append grouped DNS records (A or CNAME) to the zone file contents.
     """
-    file.write(f"; {record_type} Records\n")
+    append = parts.append
+    append(f"; {record_type} Records\n")
     for ttl, record_list in records.items():
-        file.write(f"; TTL {ttl}\n")
+        append(f"; TTL {ttl}\n")
         for domain, value in record_list:
-            file.write(f"{domain}\t{ttl}\tIN {record_type}\t{value}\n")
-        file.write("\n")
+            append(f"{domain}\t{ttl}\tIN {record_type}\t{value}\n")
+        append("\n")
 
 def generate_reverse_zone(json_data: Dict[str, Any], reverse_zones: Dict[str, List[tuple]]):
     """
     Generate reverse zone entries from the parsed JSON data.
     """
+    # Bound append of each subnet's entry list, so the per-record work is a
+    # single dict lookup and no throwaway setdefault list is allocated
+    subnet_appenders = {}
+    get_appender = subnet_appenders.get
     for domain, data in json_data.items():
         if domain != 'root':
-            for record in data['DNS_Records']:
-                if record['type'] == 'A':
-                    ip_parts = record['ip'].split('.')
-                    reversed_ip = '.'.join(reversed(ip_parts))
-                    subnet = '.'.join(ip_parts[:3])
-                    # Use setdefault to simplify the dictionary update
-                    reverse_zones.setdefault(subnet, []).append((reversed_ip, domain))
+            for record in data['by_type']['A']:
+                a, b, c, d = record.ip.split('.')
+                subnet = sys.intern(f"{a}.{b}.{c}")
+                add_entry = get_appender(subnet)
+                if add_entry is None:
+                    add_entry = subnet_appenders[subnet] = reverse_zones.setdefault(subnet, []).append
+                add_entry((f"{d}.{c}.{b}.{a}", domain))
 
 def write_reverse_zone_files(reverse_zones: Dict[str, List[tuple]]):
     """
     Write reverse zone files for each subnet.
     """
-    mstbind_subnet = '.'.join(HOST_IPV4.split('.')[:3])
-    reversed_host_ipv4 = '.'.join(reversed(HOST_IPV4.split('.')))
+    if not reverse_zones:
+        return
 
-    for subnet, records in reverse_zones.items():
-        reverse_file = f"reverse_zone/db.{subnet}.arpa"
-        with open(reverse_file, 'w') as f:
-            write_reverse_zone_header(f)
-            for reversed_ip, domain in records:
-                first_octet = reversed_ip.split('.')[0]
-                f.write(f"{first_octet}\tIN\tPTR\t{domain}.{DOMAIN_NAME}.\n")
+    # Each subnet file is independent, so overlap the file writes
+    with ThreadPoolExecutor(max_workers=min(32, len(reverse_zones))) as executor:
+        list(executor.map(write_reverse_zone_file, reverse_zones.keys(), reverse_zones.values()))
+
+def write_reverse_zone_file(subnet: str, records: List[tuple]):
+    """
+    Write the reverse zone file for a single subnet.
+    """
+    parts = []
+    append = parts.append
+    write_reverse_zone_header(parts)
+    for reversed_ip, domain in records:
+        first_octet = reversed_ip.partition('.')[0]
+        append(f"{first_octet}\tIN\tPTR\t{domain}.{DOMAIN_NAME}.\n")
 
-            # Add reverse zone entry for mstbind if in the same subnet
-            if subnet == mstbind_subnet:
-                f.write(f"{reversed_host_ipv4.split('.')[0]}\tIN\tPTR\t{SOA_NS_ENTRY}.\n")
+    # Add reverse zone entry for mstbind if in the same subnet
+    if subnet == _MSTBIND_SUBNET:
+        append(f"{_MSTBIND_PTR}\tIN\tPTR\t{SOA_NS_ENTRY}.\n")
 
-def write_reverse_zone_header(file):
+    reverse_file = f"reverse_zone/db.{subnet}.arpa"
+    with open(reverse_file, 'w', buffering=IO_BUFFER_SIZE) as f:
+        f.write("".join(parts))
+
+def write_reverse_zone_header(parts: List[str]):
     """
-    Write the header for a reverse zone file.
+    Append the header for a reverse zone file.
     """
-    file.write(f"$TTL 86400\n")
-    file.write(f"@ IN SOA {SOA_NS_ENTRY}. {SOA_HOSTMASTER_ENTRY} (\n")
-    file.write(f"\t1 ; Serial\n")
-    file.write(f"\t604800 ; Refresh\n")
-    file.write(f"\t86400 ; Retry\n")
-    file.write(f"\t2419200 ; Expire\n")
-    file.write(f"\t86400 ; Minimum TTL\n")
-    file.write(")\n\n")
-    file.write(f"@ IN NS {SOA_NS_ENTRY}.\n\n")
+    parts.append(
+        f"$TTL 86400\n"
+        f"@ IN SOA {SOA_NS_ENTRY}. {SOA_HOSTMASTER_ENTRY} (\n"
+        f"\t1 ; Serial\n"
+        f"\t604800 ; Refresh\n"
+        f"\t86400 ; Retry\n"
+        f"\t2419200 ; Expire\n"
+        f"\t86400 ; Minimum TTL\n"
+        ")\n\n"
+        f"@ IN NS {SOA_NS_ENTRY}.\n\n"
+    )
 
 def generate_bind9_config(input_file: str, output_file: str, reverse_zones: Dict[str, List[tuple]]):
     """
     Generate the main BIND9 configuration file.
     """
-    with open(input_file, 'r') as f:
+    with open(input_file, 'r', buffering=IO_BUFFER_SIZE) as f:
         zones = [line.strip() for line in f if line.strip()]
 
-    with open(output_file, 'w') as f:
-        f.write("// BIND configuration file\n")
-        f.write("    // Place additional options here.\n\n\n")
-        # Write forward zone configurations
-        for zone in zones:
-            write_zone_config(f, zone, "forward_zone")
+    parts = ["// BIND configuration file\n"
+             "    // Place additional options here.\n\n\n"]
+    # Write forward zone configurations
+    for zone in zones:
+        write_zone_config(parts, zone, "forward_zone")
+
+    # Write reverse zone configurations
+    for subnet in reverse_zones:
+        a, b, c = subnet.split('.')
+        reverse_zone = f"{c}.{b}.{a}.in-addr.arpa"
+        write_zone_config(parts, reverse_zone, "reverse_zone", f"db.{subnet}.arpa")
 
-        # Write reverse zone configurations
-        for subnet in reverse_zones:
-            reversed_subnet = '.'.join(reversed(subnet.split('.')))
-            reverse_zone = f"{reversed_subnet}.in-addr.arpa"
-            write_zone_config(f, reverse_zone, "reverse_zone", f"db.{subnet}.arpa")
+    with open(output_file, 'w', buffering=IO_BUFFER_SIZE) as f:
+        f.write("".join(parts))
 
     print(f"BIND configuration file has been generated: {output_file}")
 
-def write_zone_config(file, zone: str, zone_type: str, db_file: str = None):
+def write_zone_config(parts: List[str], zone: str, zone_type: str, db_file: str = None):
+    """
+    Append a single zone configuration block.
+    """
+    parts.append(
+        f'zone "{zone}" in {{\n'
+        "    type master;\n"
+        f'    file "/etc/bind/{zone_type}/{db_file or f"db.{zone}"}";'
+        "\n};\n\n"
+    )
+
+def write_json(dns_json: Dict[str, Any], output_file: str):
+    """
+    Write the parsed zone data as indented JSON, using orjson when available.
+    """
+    # The by_type index only duplicates DNS_Records
+    dns_json = {name: {key: value for key, value in data.items() if key != 'by_type'}
+                for name, data in dns_json.items()}
+    if orjson is not None:
+        with open(output_file, 'wb') as json_file:
+            json_file.write(orjson.dumps(dns_json, default=Record.to_dict, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_file, 'w', buffering=IO_BUFFER_SIZE) as json_file:
+            json.dump(dns_json, json_file, indent=2, default=Record.to_dict)
+
+def process_zone(zone: str) -> Dict[str, List[tuple]]:
     """
-    Write a single zone configuration block.
+    Parse a single zone, write its forward zone file and return its reverse zone entries.
     """
-    file.write(f'zone "{zone}" in {{\n')
-    file.write("    type master;\n")
-    file.write(f'    file "/etc/bind/{zone_type}/{db_file or f"db.{zone}"}";')
-    file.write("\n};\n\n")
+    reverse_zones = {}
+    file_path = f"zone_query/{zone}.txt"
+    dns_json = parse_file(file_path)
+
+    # Write JSON output for debugging or further processing
+    if DEBUG_JSON:
+        write_json(dns_json, f"json/{zone}.json")
+
+    # Generate forward zone file
+    generate_bind9_zone(dns_json, zone, f"forward_zone/db.{zone}")
+
+    # Collect reverse zone information
+    generate_reverse_zone(dns_json, reverse_zones)
+
+    return reverse_zones
 
 def main():
     """
     Main function to orchestrate the DNS zone file generation process.
     """
+    run_dns_dumper()
+    # Worker processes only write into these, so create them once up front
+    _ensure_dirs()
+
     reverse_zones = {}
 
     # Read the list of zones from the zone file
-    with open(ZONE_FILE, 'r') as file:
+    with open(ZONE_FILE, 'r', buffering=IO_BUFFER_SIZE) as file:
         zones = [line.strip() for line in file if line.strip()]
 
-    for zone in zones:
-        file_path = f"zone_query/{zone}.txt"
-        dns_json = parse_file(file_path)
-        
-        # Write JSON output for debugging or further processing
-        with open(f"json/{zone}.json", 'w') as json_file:
-            json.dump(dns_json, json_file, indent=2)
-        
-        # Generate forward zone file
-        generate_bind9_zone(dns_json, zone, f"forward_zone/db.{zone}")
-        
-        # Collect reverse zone information
-        generate_reverse_zone(dns_json, reverse_zones)
+    # Zones are independent, so parse and write them in parallel and merge
+    # the reverse zone entries in zone order afterwards
+    with ProcessPoolExecutor() as executor:
+        for partial in executor.map(process_zone, zones):
+            for subnet, records in partial.items():
+                reverse_zones.setdefault(subnet, []).extend(records)
 
     # Write reverse zone files
     write_reverse_zone_files(reverse_zones)